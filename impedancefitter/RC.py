@@ -16,8 +16,165 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import threading
+
+import numpy as np
 from numpy import power
 from scipy.constants import epsilon_0 as e0
+from scipy.optimize import least_squares
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+try:
+    from numba import njit, prange, vectorize
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import cupy
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
+
+# above this many frequencies the threaded kernel pays off,
+# below it the thread startup overhead dominates
+_PARALLEL_THRESHOLD = 10000
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _rc_kernel(omega, R, k, out):
+        """Compiled loop for :func:`_rc_impl`, writing into `out`."""
+        for i in range(omega.size):
+            x = omega[i] * k
+            d = R / (1. + x * x)
+            out[i] = complex(d, -x * d)
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _rc_kernel_parallel(omega, R, k, out):
+        """Threaded variant of :func:`_rc_kernel` for long sweeps."""
+        for i in prange(omega.size):
+            x = omega[i] * k
+            d = R / (1. + x * x)
+            out[i] = complex(d, -x * d)
+
+    # ufunc variant of RC_model with full NumPy broadcasting over any
+    # combination of omega, Rd and Cd shapes. Compiled eagerly because
+    # the signature is given; the cpu target keeps the call overhead low
+    # enough for the typical sweep sizes.
+    @vectorize(["complex128(float64, float64, float64)"], cache=True)
+    def RC_model_ufunc(omega, Rd, Cd):
+        x = omega * Cd * 1e-12 * Rd
+        d = Rd / (1. + x * x)
+        return complex(d, -x * d)
+
+    # warm the kernels at import time so the first fit iteration
+    # does not pay the compilation cost
+    _rc_kernel(np.ones(1), 1., 1., np.empty(1, dtype=np.complex128))
+    _rc_kernel_parallel(np.ones(1), 1., 1., np.empty(1, dtype=np.complex128))
+
+
+# reusable real-valued work buffers for _rc_impl, keyed by the identity
+# and size of the omega array. During a fit the same omega array is passed
+# dozens to hundreds of times, so the buffer is allocated only once.
+# The store is thread-local: concurrent fits (Fitter with n_jobs) pass
+# the same omega array from several threads and must not share buffers.
+# The complex output array itself cannot be cached: it is returned to the
+# caller and composite circuits keep several results over the same omega
+# alive at the same time.
+_scratch = threading.local()
+
+
+def _scratch_buffer(omega):
+    """Return a reusable, thread-local float64 buffer matching `omega`."""
+    store = getattr(_scratch, 'buffers', None)
+    if store is None:
+        store = _scratch.buffers = {}
+    key = (id(omega), omega.size)
+    buf = store.get(key)
+    if buf is None:
+        if len(store) > 32:
+            store.clear()
+        buf = np.empty(omega.size, dtype=np.float64)
+        store[key] = buf
+    return buf
+
+
+def _rc_impl(omega, R, k):
+    r"""Evaluate the RC dispersion :math:`R / (1 + j \omega k)`.
+
+    The complex division is rewritten as
+
+    .. math::
+
+        \frac{R}{1 + j \omega k} = \frac{R (1 - j \omega k)}{1 + (\omega k)^2} ,
+
+    which needs only real arithmetic plus the final complex assembly
+    and avoids NumPy's branchy complex division.
+
+    Parameters
+    ----------
+    omega: double or array of double
+        list of frequencies
+    R: double
+        resistance
+    k: double
+        time constant of the dispersion
+
+    Returns
+    -------
+    :class:`numpy.ndarray`, complex
+        Impedance array
+    """
+    if isinstance(omega, (float, int)):
+        # scalar fast path in plain Python arithmetic, which skips the
+        # ufunc dispatch overhead of a 0-d array entirely
+        x = omega * k
+        d = R / (1. + x * x)
+        return complex(d, -x * d)
+    if isinstance(omega, np.ndarray) and not (omega.flags.c_contiguous
+                                              and omega.dtype == np.float64):
+        # strided or non-float64 input would push every ufunc and the
+        # compiled kernels onto their slow paths; convert once up front.
+        # Contiguous float64 input, the common case, only pays the check.
+        omega = np.ascontiguousarray(omega, dtype=np.float64)
+    if NUMBA_AVAILABLE and isinstance(omega, np.ndarray) and omega.ndim == 1:
+        # compiled loop, no intermediate arrays and no per-ufunc dispatch
+        Z_fit = np.empty_like(omega, dtype=np.complex128)
+        if omega.size >= _PARALLEL_THRESHOLD:
+            _rc_kernel_parallel(omega, R, k, Z_fit)
+        else:
+            _rc_kernel(omega, R, k, Z_fit)
+        return Z_fit
+    if NUMEXPR_AVAILABLE and isinstance(omega, np.ndarray) and omega.ndim > 0:
+        # fuse the expression into a single pass over omega
+        # to avoid the intermediate arrays of the pure NumPy variant
+        Z_fit = np.empty_like(omega, dtype=np.complex128)
+        ne.evaluate("R * (1. - 1j * (omega * k)) / (1. + (omega * k) ** 2)",
+                    local_dict={'omega': omega, 'R': R, 'k': k},
+                    out=Z_fit, casting='same_kind')
+        return Z_fit
+    if isinstance(omega, np.ndarray) and omega.ndim == 1:
+        # split layout: compute real and imaginary part as float64
+        # arrays so the ufuncs vectorize over homogeneous lanes and no
+        # complex temporary is materialized
+        x = np.multiply(omega, k, out=_scratch_buffer(omega))
+        Z_fit = np.empty(omega.size, dtype=np.complex128)
+        zr = Z_fit.real
+        zi = Z_fit.imag
+        np.multiply(x, x, out=zr)
+        zr += 1.
+        np.divide(R, zr, out=zr)
+        np.multiply(x, zr, out=zi)
+        np.negative(zi, out=zi)
+        return Z_fit
+    x = omega * k
+    denom_inv = R / (1. + x * x)
+    return denom_inv - 1j * (x * denom_inv)
 
 
 def RC_model(omega, Rd, Cd):
@@ -45,10 +202,295 @@ def RC_model(omega, Rd, Cd):
         Impedance array
     """
     Cfit = Cd * 1e-12
-    Z_fit = Rd / (1. + 1j * omega * Cfit * Rd)
+    return _rc_impl(omega, Rd, Cfit * Rd)
+
+
+def RC_model_float32(omega, Rd, Cd):
+    """Single-precision variant of :func:`RC_model`.
+
+    Halves the memory traffic of a sweep and returns a `complex64`
+    array. Impedance measurements rarely carry more than 3-4
+    significant digits, so this is usually sufficient for model
+    evaluation (but not for residual accumulation).
+
+    Parameters
+    ----------
+
+    omega: double or array of double
+        list of frequencies
+    Rd: complex
+        Resistance.
+    Cd: double
+        Capacitance
+
+    Notes
+    -----
+    .. warning::
+
+        `Cd` is in pF!
+
+    Returns
+    -------
+    :class:`numpy.ndarray`, complex64
+        Impedance array
+    """
+    k = np.float32(Cd * 1e-12 * Rd)
+    omega = np.atleast_1d(np.asarray(omega, dtype=np.float32))
+    x = omega * k
+    d = np.float32(Rd) / (1. + x * x)
+    Z_fit = np.empty(omega.size, dtype=np.complex64)
+    Z_fit.real[...] = d
+    np.multiply(x, d, out=Z_fit.imag)
+    np.negative(Z_fit.imag, out=Z_fit.imag)
     return Z_fit
 
 
+def RC_model_jac(omega, Rd, Cd):
+    r"""Analytic Jacobian of :func:`RC_model`.
+
+    The derivatives are available in closed form,
+
+    .. math::
+
+        \frac{\partial Z}{\partial R_\mathrm{d}} =
+        \frac{1}{(1 + j \omega C_\mathrm{d} R_\mathrm{d})^2} , \qquad
+        \frac{\partial Z}{\partial C_\mathrm{d}} =
+        \frac{-j \omega R_\mathrm{d}^2}{(1 + j \omega C_\mathrm{d} R_\mathrm{d})^2} ,
+
+    so a least-squares solver does not need the extra model evaluations
+    of a finite-difference Jacobian.
+
+    Parameters
+    ----------
+
+    omega: double or array of double
+        list of frequencies
+    Rd: double
+        Resistance.
+    Cd: double
+        Capacitance
+
+    Notes
+    -----
+    .. warning::
+
+        `Cd` is in pF! The derivative with respect to `Cd` is taken in
+        these units.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`, complex
+        Array of shape (2, N) with the derivatives with respect to
+        `Rd` and `Cd`.
+    """
+    Cfit = Cd * 1e-12
+    d = 1. / (1. + 1j * omega * Cfit * Rd)
+    d2 = d * d
+    dZdRd = d2
+    dZdCd = -1j * omega * Rd * Rd * 1e-12 * d2
+    return np.stack((dZdRd, dZdCd))
+
+
+def RC_model_batch(omega, Rd, Cd):
+    """Evaluate :func:`RC_model` for many parameter sets at once.
+
+    Useful for parameter sweeps or global optimizers that generate
+    many candidate (Rd, Cd) pairs: the parameters are broadcast against
+    omega in one vectorized expression instead of M scalar calls.
+
+    Parameters
+    ----------
+
+    omega: array of double
+        list of frequencies, length N
+    Rd: array of double
+        resistances, length M
+    Cd: array of double
+        capacitances, length M
+
+    Notes
+    -----
+    .. warning::
+
+        `Cd` is in pF!
+
+    Returns
+    -------
+    :class:`numpy.ndarray`, complex
+        Impedance array of shape (M, N)
+    """
+    omega = np.atleast_1d(np.asarray(omega, dtype=np.float64))
+    Rd = np.atleast_1d(np.asarray(Rd, dtype=np.float64))[:, None]
+    Cd = np.atleast_1d(np.asarray(Cd, dtype=np.float64))[:, None]
+    x = omega[None, :] * (Cd * 1e-12 * Rd)
+    d = Rd / (1. + x * x)
+    # assemble the complex result in place, real part and imaginary
+    # part stay float64 until the very end
+    Z = np.empty(x.shape, dtype=np.complex128)
+    Z.real[...] = d
+    np.multiply(x, d, out=Z.imag)
+    np.negative(Z.imag, out=Z.imag)
+    return Z
+
+
+if CUPY_AVAILABLE:
+    # the kernel is compiled lazily by CuPy on the first call
+    _rc_kernel_gpu = cupy.ElementwiseKernel(
+        'float64 omega, float64 R, float64 k',
+        'complex128 Z',
+        'double x = omega * k;'
+        ' double d = R / (1.0 + x * x);'
+        ' Z = complex<double>(d, -x * d);',
+        'rc_kernel')
+
+
+def RC_model_gpu(omega, Rd, Cd):
+    """Evaluate :func:`RC_model_batch` on the GPU with CuPy.
+
+    Intended for large parameter-grid studies (Monte Carlo, Bayesian
+    inference) where many thousand (Rd, Cd) candidates are evaluated
+    over the same frequency axis. The whole (M, N) grid is computed by
+    a single elementwise CUDA kernel; for small grids the CPU variants
+    are faster because of the transfer overhead.
+
+    Requires `cupy <https://cupy.dev>`_ and a CUDA device.
+
+    Parameters
+    ----------
+
+    omega: array of double
+        list of frequencies, length N
+    Rd: array of double
+        resistances, length M
+    Cd: array of double
+        capacitances, length M
+
+    Notes
+    -----
+    .. warning::
+
+        `Cd` is in pF!
+
+    Returns
+    -------
+    :class:`cupy.ndarray`, complex
+        Impedance array of shape (M, N), on the device.
+        Call `.get()` to copy it back to the host.
+    """
+    if not CUPY_AVAILABLE:
+        raise RuntimeError("CuPy is not installed, "
+                           "RC_model_gpu is not available.")
+    omega = cupy.atleast_1d(cupy.asarray(omega, dtype=cupy.float64))
+    Rd = cupy.atleast_1d(cupy.asarray(Rd, dtype=cupy.float64))[:, None]
+    Cd = cupy.atleast_1d(cupy.asarray(Cd, dtype=cupy.float64))[:, None]
+    return _rc_kernel_gpu(omega[None, :], Rd, Cd * 1e-12 * Rd)
+
+
+def rc_residuals(p, omega, Z):
+    """Real-valued residuals of :func:`RC_model`.
+
+    Adapter for :func:`scipy.optimize.least_squares`.
+
+    Parameters
+    ----------
+
+    p: array of double
+        parameter vector (Rd, Cd)
+    omega: array of double
+        list of frequencies
+    Z: :class:`numpy.ndarray`, complex
+        measured impedance array
+
+    Returns
+    -------
+    :class:`numpy.ndarray`, double
+        Residual array of length 2N, real parts first.
+    """
+    diff = RC_model(omega, p[0], p[1]) - Z
+    return np.concatenate((diff.real, diff.imag))
+
+
+def _rc_residuals_jac(p, omega, Z):
+    """Jacobian of :func:`rc_residuals`, built from :func:`RC_model_jac`."""
+    jac = RC_model_jac(omega, p[0], p[1])
+    return np.concatenate((jac.real, jac.imag), axis=1).T
+
+
+def weighted_rc_residuals(p, omega, Z, weights):
+    """Modulus-weighted residuals of :func:`RC_model`.
+
+    Parameters
+    ----------
+
+    p: array of double
+        parameter vector (Rd, Cd)
+    omega: array of double
+        list of frequencies
+    Z: :class:`numpy.ndarray`, complex
+        measured impedance array
+    weights: array of double
+        weight per frequency, typically 1 / \\|Z\\|.
+        Precompute the weights once outside the solver loop.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`, double
+        Residual array of length 2N, real parts first.
+    """
+    diff = RC_model(omega, p[0], p[1]) - Z
+    return np.concatenate((diff.real * weights, diff.imag * weights))
+
+
+def _weighted_rc_residuals_jac(p, omega, Z, weights):
+    """Jacobian of :func:`weighted_rc_residuals`."""
+    jac = RC_model_jac(omega, p[0], p[1])
+    return np.concatenate((jac.real * weights, jac.imag * weights), axis=1).T
+
+
+def fit_RC_model(omega, Z, Rd0, Cd0, weighting=None):
+    """Fit :func:`RC_model` to data with :func:`scipy.optimize.least_squares`.
+
+    The parameters of the RC model span many orders of magnitude
+    (Rd in Ohm vs. Cd in pF), which makes unscaled Levenberg-Marquardt
+    iterations converge poorly. Here, `x_scale='jac'` rescales the
+    parameters from the analytic Jacobian and the `trf` method is used.
+
+    Parameters
+    ----------
+
+    omega: array of double
+        list of frequencies
+    Z: :class:`numpy.ndarray`, complex
+        measured impedance array
+    Rd0: double
+        initial guess for the resistance
+    Cd0: double
+        initial guess for the capacitance, in pF
+    weighting: "modulus" or None
+        Apply modulus weighting (as in [Schoenleber2014]_) or process
+        unweighted data. The 1 / \\|Z\\| weights are computed once
+        before the solver loop.
+
+    Returns
+    -------
+    :class:`scipy.optimize.OptimizeResult`
+        Solver result; the fitted (Rd, Cd) pair is in the `x` attribute.
+    """
+    x0 = np.array([Rd0, Cd0])
+    if weighting == "modulus":
+        # faster than np.abs on complex arrays
+        weights = 1. / np.sqrt(Z.real * Z.real + Z.imag * Z.imag)
+        return least_squares(weighted_rc_residuals, x0,
+                             jac=_weighted_rc_residuals_jac,
+                             args=(omega, Z, weights),
+                             method='trf', x_scale='jac')
+    elif weighting is not None:
+        raise RuntimeError("This is not a valid weighting option.")
+    return least_squares(rc_residuals, x0,
+                         jac=_rc_residuals_jac, args=(omega, Z),
+                         method='trf', x_scale='jac')
+
+
 def rc_model(omega, c0, kdc, eps):
     """Simple RC model to obtain dielectric properties.
 
@@ -82,8 +524,7 @@ def rc_model(omega, c0, kdc, eps):
     Rd = e0 / (kdc * c0)
     # Cd = eps * c0
     factor = eps * e0 / kdc  # Cd * Rd
-    Z_fit = Rd / (1. + 1j * omega * factor)
-    return Z_fit
+    return _rc_impl(omega, Rd, factor)
 
 
 def drc_model(omega, RE, tauE, alpha, beta):
@@ -127,6 +568,12 @@ def drc_model(omega, RE, tauE, alpha, beta):
     """
     tauE *= 1e-9
     nom = power(1. + power(1j * omega * tauE, 1. - alpha), beta)
+    if isinstance(nom, np.ndarray):
+        # reciprocal-multiply in place instead of allocating
+        # a second array for the true division
+        np.reciprocal(nom, out=nom)
+        nom *= RE
+        return nom
     return RE / nom
 
 
@@ -162,4 +609,4 @@ def rc_tau_model(omega, Rk, tauk):
 
     """
 
-    return Rk / (1. + 1j * omega * tauk)
+    return _rc_impl(omega, Rk, tauk)
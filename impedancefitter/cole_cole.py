@@ -19,6 +19,47 @@
 from scipy.constants import epsilon_0 as e0
 import numpy as np
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _cole_cole_kernel(omega, c0, epsl, tau, a, sigma, epsinf):
+        """Compiled Cole-Cole loop, fusing the elementwise arithmetic.
+
+        Uses the polar form :math:`(j \\omega \\tau)^a =
+        (\\omega \\tau)^a \\exp(j a \\pi / 2)` to avoid complex powers.
+        """
+        Z = np.empty(omega.size, dtype=np.complex128)
+        ca = np.cos(0.5 * np.pi * a)
+        sa = np.sin(0.5 * np.pi * a)
+        deps = epsl - epsinf
+        for i in range(omega.size):
+            x = (omega[i] * tau)**a
+            es = epsinf + deps / complex(1. + x * ca, x * sa) - 1j * sigma / (omega[i] * e0)
+            Z[i] = 1. / (1j * omega[i] * c0 * es)
+        return Z
+
+    @njit(cache=True, fastmath=True)
+    def _cole_cole_R_kernel(omega, Rinf, R0, tau, a):
+        """Compiled loop for the macroscopic Cole-Cole circuit."""
+        Z = np.empty(omega.size, dtype=np.complex128)
+        ca = np.cos(0.5 * np.pi * a)
+        sa = np.sin(0.5 * np.pi * a)
+        dR = R0 - Rinf
+        for i in range(omega.size):
+            x = (omega[i] * tau)**a
+            Z[i] = Rinf + dR / complex(1. + x * ca, x * sa)
+        return Z
+
+    # warm the caches at import so the first fit does not pay for compilation
+    _cole_cole_kernel(np.ones(1), 1e-12, 1e3, 1e-9, 0.9, 0.1, 80.)
+    _cole_cole_R_kernel(np.ones(1), 0., 100., 1e-9, 0.9)
+
 
 def cole_cole_model(omega, c0, epsl, tau, a, sigma, epsinf):
     r"""Cole-Cole model for dielectric properties.
@@ -79,6 +120,10 @@ def cole_cole_model(omega, c0, epsl, tau, a, sigma, epsinf):
     """
     tau *= 1e-9  # use ns as unit
     c0 *= 1e-12  # use pF as unit
+    if NUMBA_AVAILABLE and isinstance(omega, np.ndarray) and omega.ndim == 1:
+        omega = np.ascontiguousarray(omega, dtype=np.float64)
+        return _cole_cole_kernel(omega, float(c0), float(epsl), float(tau),
+                                 float(a), float(sigma), float(epsinf))
     es = epsinf + (epsl - epsinf) / (1. + np.power((1j * omega * tau), a)) - 1j * sigma / (omega * e0)
 
     Z_fit = 1. / (1j * omega * c0 * es)
@@ -134,6 +179,9 @@ def cole_cole_R_model(omega, Rinf, R0, tau, a):
            ACADEMIC PRESS INC. https://doi.org/10.1016/b978-1-4832-3111-2.50008-0
     """
     tau *= 1e-9  # use ns as unit
+    if NUMBA_AVAILABLE and isinstance(omega, np.ndarray) and omega.ndim == 1:
+        omega = np.ascontiguousarray(omega, dtype=np.float64)
+        return _cole_cole_R_kernel(omega, float(Rinf), float(R0), float(tau), float(a))
     Z_fit = Rinf + (R0 - Rinf) / (1. + np.power(1j * omega * tau, a))
     return Z_fit
 
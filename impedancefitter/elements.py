@@ -18,6 +18,39 @@
 
 import numpy as np
 
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _cpe_kernel(omega, k, alpha):
+        """Compiled CPE loop.
+
+        Uses the polar form :math:`(j \\omega)^{-\\alpha} =
+        \\omega^{-\\alpha} \\exp(-j \\alpha \\pi / 2)` to avoid
+        complex powers.
+        """
+        Z = np.empty(omega.size, dtype=np.complex128)
+        ca = np.cos(0.5 * np.pi * alpha)
+        sa = np.sin(0.5 * np.pi * alpha)
+        for i in range(omega.size):
+            x = k * omega[i]**(-alpha)
+            Z[i] = complex(x * ca, -x * sa)
+        return Z
+
+    # warm the cache at import so the first fit does not pay for compilation
+    _cpe_kernel(np.ones(1), 1e-7, 0.9)
+
 
 def log(Z1, dummy):
     """Return logarithm of impedance for LMFIT
@@ -117,6 +150,19 @@ def Z_CPE(omega, k, alpha):
         Impedance array
 
     """
+    if isinstance(omega, np.ndarray) and omega.ndim == 1:
+        if NUMBA_AVAILABLE:
+            omega = np.ascontiguousarray(omega, dtype=np.float64)
+            return _cpe_kernel(omega, float(k), float(alpha))
+        if NUMEXPR_AVAILABLE:
+            # same polar form as the compiled kernel, evaluated in one
+            # fused pass by numexpr
+            ca = np.cos(0.5 * np.pi * alpha)
+            sa = np.sin(0.5 * np.pi * alpha)
+            return ne.evaluate("k * omega**(-alpha) * complex(ca, -sa)",
+                               local_dict={'omega': omega, 'k': k,
+                                           'alpha': alpha, 'ca': ca,
+                                           'sa': sa})
     return k * np.power(1j * omega, -alpha)
 
 
@@ -211,7 +257,9 @@ def Z_ws(omega, Aw, B):
 
     """
 
-    return Aw / np.sqrt(1j * omega) * np.tanh(B * np.sqrt(1j * omega))
+    # compute sqrt(1j * omega) only once
+    sq = np.sqrt(1j * omega)
+    return Aw / sq * np.tanh(B * sq)
 
 
 def Z_wo(omega, Aw, B):
@@ -248,4 +296,6 @@ def Z_wo(omega, Aw, B):
 
     """
 
-    return Aw / np.sqrt(1j * omega) / np.tanh(B * np.sqrt(1j * omega))
+    # compute sqrt(1j * omega) only once
+    sq = np.sqrt(1j * omega)
+    return Aw / sq / np.tanh(B * sq)
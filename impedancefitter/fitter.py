@@ -18,6 +18,7 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
 import lmfit
@@ -25,8 +26,16 @@ import lmfit
 import pandas as pd
 import yaml
 from copy import deepcopy
+from scipy.optimize import least_squares
+
+try:
+    # libyaml-backed dumper, much faster than the pure-Python default
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
 
 from .utils import set_parameters, get_equivalent_circuit_model, get_labels, _return_resistance_capacitance
+from .RC import RC_model_jac
 from .readin import (readin_Data_from_TXT_file,
                      readin_Data_from_collection,
                      readin_Data_from_csv_E4980AL,
@@ -37,6 +46,24 @@ from . import set_logger
 import logging
 logger = logging.getLogger(__name__)
 
+# percentiles of the normal distribution at the 3, 2 and 1 sigma levels,
+# the median and the corresponding upper limits.
+# precomputed from .5 * (1. -/+ erf(n / sqrt(2))) for n = 3, 2, 1
+_SIGMA_PERCENTILES = [0.0013498980316301035,
+                      0.02275013194817921,
+                      0.15865525393145707,
+                      0.5,
+                      0.8413447460685429,
+                      0.9772498680518208,
+                      0.9986501019683699]
+
+# analytic Jacobians for the direct least_squares path, keyed by the
+# lmfit model name. Each entry holds the complex derivative function
+# and the parameter order it expects. With an analytic Jacobian the
+# solver needs one residual evaluation per iteration instead of
+# n_params + 1 with finite differences.
+_model_jacobians = {'RC_model': (RC_model_jac, ['Rd', 'Cd'])}
+
 
 class Fitter(object):
     """
@@ -97,6 +124,11 @@ class Fitter(object):
         Decide if you want to see the plots during the fitting procedure.
     savefig: bool, optional
         Decide if you want to save the plots. Default is False.
+    use_cache: bool, optional
+        Cache the parsed data of each file in an `.npz` file next to it
+        and load from there as long as the data file has not changed.
+        Useful when the same directory is fitted repeatedly, e.g. during
+        parameter tuning. Default is False.
     trace_b: string, optional
         For TXT files, which contain more than one trace.
         The data is only read in until
@@ -148,27 +180,41 @@ class Fitter(object):
             directory = os.getcwd()
         self.directory = directory + '/'
 
-        set_logger(self.LogLevel)
+        set_logger(self._log_level_num)
 
         self.omega_dict = {}
         self.z_dict = {}
-        # read in all data and store it
+        self.fit_data = {}
+        self._outfile = None
+        # read in all data and store it.
+        # os.scandir provides the file type without an extra stat call,
+        # which keeps the ingest loop cheap for large data directories
         if self.fileList is None:
-            self.fileList = os.listdir(self.directory)
-        read_data_sets = 0
+            self.fileList = [entry.name for entry in os.scandir(self.directory)
+                             if entry.is_file()]
+        candidates = []
         for filename in self.fileList:
-            if self.data_sets:
-                if read_data_sets == self.data_sets:
-                    logger.debug("Reached maximum number of data sets.")
-                    break
             filename = os.fsdecode(filename)
             if filename.endswith(self.excludeEnding):
                 logger.info("""Skipped file {}
                              due to excluded ending.""".format(filename))
                 continue
-
+            candidates.append(filename)
+
+        # reading and parsing the files is I/O-bound, so the files are
+        # read concurrently; the results are stored in fileList order to
+        # keep the dictionaries deterministic
+        results = []
+        if candidates:
+            with ThreadPoolExecutor(max_workers=min(32, len(candidates))) as pool:
+                results = list(pool.map(self._read_data, candidates))
+        read_data_sets = 0
+        for filename, (status, omega, zarray) in zip(candidates, results):
+            if self.data_sets:
+                if read_data_sets == self.data_sets:
+                    logger.debug("Reached maximum number of data sets.")
+                    break
             # continues only if data could be read in
-            (status, omega, zarray) = self._read_data(filename)
             if status:
                 self.omega_dict[str(filename)] = omega
                 self.z_dict[str(filename)] = zarray
@@ -200,6 +246,8 @@ class Fitter(object):
         self.eps = False
         self.solver_kwargs = {}
         self.weighting = None
+        self.direct = False
+        self.use_cache = False
         self.show = False
         self.savemodelresult = True
         self.report = False
@@ -244,6 +292,12 @@ class Fitter(object):
             self.savefig = kwargs['savefig']
         if 'delimiter' in kwargs:
             self.delimiter = kwargs['delimiter']
+        if 'use_cache' in kwargs:
+            self.use_cache = kwargs['use_cache']
+
+        # resolve the log level to its numeric value once instead of
+        # looking it up by name again later
+        self._log_level_num = getattr(logging, self.LogLevel, logging.INFO)
 
     def visualize_data(self, savefig=False, Zlog=False,
                        allinone=False, plottype="impedance",
@@ -285,7 +339,7 @@ class Fitter(object):
             append = False
             zarray = self.z_dict[key]
             iters = zarray.shape[0]
-            logger.debug("Number of data sets in file {} to visualise: {}".format(key, iters))
+            logger.debug("Number of data sets in file %s to visualise: %s", key, iters)
 
             for i in range(iters):
                 title = key + str(i)
@@ -370,7 +424,8 @@ class Fitter(object):
 
     def run(self, modelname, solver=None, parameters=None, protocol=None,
             solver_kwargs={}, modelclass="none", log=False, weighting=None,
-            show=False, report=False, savemodelresult=True, eps=False):
+            show=False, report=False, savemodelresult=True, eps=False,
+            n_jobs=1, direct=False):
         """
         Main function that iterates through all data sets provided.
 
@@ -405,6 +460,22 @@ class Fitter(object):
             Also possible: proportional weighting. See [Barsoukov2018]_ for more information.
         savemodelresult: bool, optional
             Saves all :class:`lmfit.model.ModelResult` instances to plot or evaluate uncertainty later.
+        n_jobs: int, optional
+            Number of threads used to fit the data sets, which are
+            independent of each other. Use -1 for one thread per CPU.
+            Default is 1 (sequential run as before).
+            Do not combine with `show` or `savefig` since plotting
+            is not thread-safe.
+        direct: bool, optional
+            Bypass the LMFIT fitting routine and call
+            :func:`scipy.optimize.least_squares` directly,
+            which avoids the LMFIT overhead per fit.
+            This is worthwhile for many small data sets.
+            Only used for the default least_squares solver without
+            weighting, log or eps options and outside iterative
+            protocols. Note that the results then only carry
+            `best_values`, `best_fit`, `params` and `message`,
+            not the full :class:`lmfit.model.ModelResult` interface.
 
         """
 
@@ -437,33 +508,210 @@ class Fitter(object):
         self.parameters = deepcopy(parameters)
 
         self.model_parameters = self._initialize_parameters(self.model, self.parameters, self.emcee_tag)
+        self.direct = False
+        if direct:
+            if (self.solvername == "least_squares" and protocol is None
+                    and weighting is None and not log and not eps):
+                self.direct = True
+            else:
+                logger.warning("""The direct solver path only supports the
+                                  plain least_squares setup. Falling back
+                                  to the LMFIT routine.""")
         self.protocol = protocol
         if self.write_output is True:
-            open('outfile.yaml', 'w')  # create output file
+            # results are streamed to the file as they come in, so the
+            # output survives a crash and no second pass is needed
+            self._outfile = open('outfile.yaml', 'w')
+        if n_jobs != 1:
+            self._run_parallel(n_jobs)
+        else:
+            for key in self.omega_dict:
+                self.omega = self.omega_dict[key]
+                self.zarray = self.z_dict[key]
+                self.iters = 1
+                # determine number of iterations if more than 1 data set is in file
+                if len(self.zarray.shape) > 1:
+                    self.iters = self.zarray.shape[0]
+                    logger.debug("Number of data sets:%s", self.iters)
+                if self.data_sets is not None:
+                    self.iters = self.data_sets
+                    logger.debug("""Will only iterate
+                                    over {} data sets.""".format(self.iters))
+                for i in range(self.iters):
+                    self.Z = self.zarray[i]
+                    self.fittedValues = self.process_data_from_file(key + str(i),
+                                                                    self.model,
+                                                                    self.model_parameters,
+                                                                    self.modelclass)
+                    self._process_fitting_results(key + '_' + str(i))
+        if self.write_output is True:
+            self._outfile.close()
+            self._outfile = None
+        if not self.fit_data:
+            logger.info("There was no file to process")
+
+    def stack_data(self):
+        """Stack data sets sharing a frequency grid into contiguous blocks.
+
+        Files measured on the same frequency grid are grouped and their
+        z-arrays are stacked into one contiguous complex array per grid.
+        A vectorized residual can then stream the whole block instead of
+        hopping between per-file arrays.
+
+        The result is stored in three attributes:
+
+        - :attr:`omega_blocks`: list of frequency arrays, one per group.
+        - :attr:`Z_blocks`: list of contiguous (total_iters, n_omega)
+          impedance arrays.
+        - :attr:`block_indices`: list of lists with the (filename, row)
+          origin of every block row.
+        """
+        groups = {}
+        for key in self.omega_dict:
+            omega = self.omega_dict[key]
+            zarray = np.atleast_2d(self.z_dict[key])
+            gkey = omega.tobytes()
+            if gkey not in groups:
+                groups[gkey] = (omega, [], [])
+            groups[gkey][1].append(zarray)
+            groups[gkey][2].extend([(key, i) for i in range(zarray.shape[0])])
+
+        self.omega_blocks = []
+        self.Z_blocks = []
+        self.block_indices = []
+        for omega, zarrays, origins in groups.values():
+            self.omega_blocks.append(omega)
+            self.Z_blocks.append(np.ascontiguousarray(np.vstack(zarrays)))
+            self.block_indices.append(origins)
+
+    def run_batch(self, modelname, parameters=None, solver_kwargs={},
+                  log=False, eps=False):
+        """Fit all data sets of a file jointly with one parameter set.
+
+        Instead of one fit per row of the z-array, the model is
+        evaluated once per solver iteration and the residuals of all
+        rows are stacked. This amortizes the model-evaluation and
+        solver setup cost over the whole file and vectorizes the
+        residual across the data-set axis. Use it for repeated
+        measurements of the same sample, where a single parameter set
+        should describe all traces.
+
+        Parameters
+        ----------
+
+        modelname: string
+            Name of the model to be parsed. Must be built by those provided in
+            :func:`impedancefitter.utils.available_models` and using `+`
+            and `parallel(x, y)` as possible representations of series or
+            parallel circuit.
+        parameters: dict, optional
+            Provide parameters if you do not want
+            to read them from a yaml file.
+        solver_kwargs: dict, optional
+            Customize the employed solver.
+            Interface to :func:`scipy.optimize.least_squares`.
+        log: bool, optional
+            Decide, if logscale is used for model and data.
+        eps: bool, optional
+            Decide, if the fit is done in the permittivity
+            representation. Requires the unit capacitance `c0all`
+            as model parameter.
+
+        """
+        self.modelname = modelname
+        self.log = log
+        self.eps = eps
+        self.emcee_tag = False
+        self.model = self.initialize_model(self.modelname, log=self.log, eps=self.eps)
+        if parameters is not None:
+            assert isinstance(parameters, dict), "You need to provide an input dictionary!"
+        self.parameters = deepcopy(parameters)
+        self.model_parameters = self._initialize_parameters(self.model, self.parameters)
+
+        for key in self.omega_dict:
+            omega = self.omega_dict[key]
+            zarray = np.atleast_2d(self.z_dict[key])
+            params = deepcopy(self.model_parameters)
+            # transform the data like _fit_data does, so the residual
+            # compares model and data in the same representation
+            if self.log:
+                zarray = np.log10(zarray)
+            elif self.eps:
+                zarray = 1. / (1j * omega * params['c0all'] * zarray)
+            varnames = [name for name in params if params[name].vary]
+            x0 = np.array([params[name].value for name in varnames])
+            lower = np.array([params[name].min for name in varnames])
+            upper = np.array([params[name].max for name in varnames])
+
+            z_re = np.ascontiguousarray(zarray.real)
+            z_im = np.ascontiguousarray(zarray.imag)
+
+            def residual(x):
+                for name, value in zip(varnames, x):
+                    params[name].value = value
+                Z_fit = self.model.eval(params=params, omega=omega)
+                # broadcast the model over all rows in one expression,
+                # real and imaginary lanes kept separate
+                return np.concatenate(((Z_fit.real[None, :] - z_re).ravel(),
+                                       (Z_fit.imag[None, :] - z_im).ravel()))
+
+            solution = least_squares(residual, x0, bounds=(lower, upper),
+                                     method='trf', **solver_kwargs)
+            logger.debug("Solver message: %s", solution.message)
+            for name, value in zip(varnames, solution.x):
+                params[name].value = value
+            self.fit_data[str(key)] = {name: float(params[name].value)
+                                       for name in params}
+
+    def _fit_one(self, key, i):
+        """Fit a single data set without touching shared state.
+
+        Parameters
+        ----------
+        key: str
+            Filename, which is contained in the data dictionaries
+            :attr:`omega_dict` and :attr:`z_dict`.
+        i: int
+            Index of the data set within the file.
+        """
+        omega = self.omega_dict[key]
+        Z = self.z_dict[key][i]
+        return self.process_data_from_file(key + str(i), self.model,
+                                           self.model_parameters,
+                                           self.modelclass,
+                                           omega=omega, Z=Z)
+
+    def _run_parallel(self, n_jobs):
+        """Fit all data sets concurrently with a thread pool.
+
+        The data sets are independent of each other, so the fits can run
+        concurrently; only the bookkeeping of the results is done
+        serially afterwards to keep the result dictionaries in the same
+        order as a sequential run.
+
+        Parameters
+        ----------
+        n_jobs: int
+            Number of threads, -1 for one thread per CPU.
+        """
+        jobs = []
         for key in self.omega_dict:
+            zarray = self.z_dict[key]
+            iters = 1
+            if len(zarray.shape) > 1:
+                iters = zarray.shape[0]
+            if self.data_sets is not None:
+                iters = self.data_sets
+            jobs.extend([(key, i) for i in range(iters)])
+        max_workers = None if n_jobs == -1 else n_jobs
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(lambda job: self._fit_one(*job), jobs))
+        for (key, i), fit_output in zip(jobs, results):
             self.omega = self.omega_dict[key]
             self.zarray = self.z_dict[key]
-            self.iters = 1
-            # determine number of iterations if more than 1 data set is in file
-            if len(self.zarray.shape) > 1:
-                self.iters = self.zarray.shape[0]
-                logger.debug("Number of data sets:" + str(self.iters))
-            if self.data_sets is not None:
-                self.iters = self.data_sets
-                logger.debug("""Will only iterate
-                                over {} data sets.""".format(self.iters))
-            for i in range(self.iters):
-                self.Z = self.zarray[i]
-                self.fittedValues = self.process_data_from_file(key + str(i),
-                                                                self.model,
-                                                                self.model_parameters,
-                                                                self.modelclass)
-                self._process_fitting_results(key + '_' + str(i))
-        if self.write_output is True and hasattr(self, "fit_data"):
-            outfile = open('outfile.yaml', 'W')
-            yaml.dump(self.fit_data, outfile)
-        elif not hasattr(self, "fit_data"):
-            logger.info("There was no file to process")
+            self.Z = self.zarray[i]
+            self.fittedValues = fit_output
+            self._process_fitting_results(key + '_' + str(i))
 
     def sequential_run(self, model1, model2, communicate, solver=None,
                        solver_kwargs={}, parameters1=None, parameters2=None,
@@ -529,6 +777,9 @@ class Fitter(object):
         else:
             self.emcee_tag = False
         self.solver_kwargs = solver_kwargs
+        # the direct solver path only applies to run(); a previous
+        # run(direct=True) must not short-circuit the fits here
+        self.direct = False
         # initialize model
         self.model1 = self.initialize_model(model1, self.log, self.eps)
         self.model2 = self.initialize_model(model2, self.log, self.eps)
@@ -549,7 +800,7 @@ class Fitter(object):
 
         self.protocol = protocol
         if self.write_output is True:
-            open('outfile.yaml', 'w')  # create output file
+            self._outfile = open('outfile-sequential.yaml', 'w')
         for key in self.omega_dict:
             self.omega = self.omega_dict[key]
             self.zarray = self.z_dict[key]
@@ -557,7 +808,7 @@ class Fitter(object):
             # determine number of iterations if more than 1 data set is in file
             if len(self.zarray.shape) > 1:
                 self.iters = self.zarray.shape[0]
-                logger.debug("Number of data sets:" + str(iters))
+                logger.debug("Number of data sets:%s", iters)
             if self.data_sets is not None:
                 self.iters = self.data_sets
                 logger.debug("""Will only iterate
@@ -581,10 +832,10 @@ class Fitter(object):
                                                                  self.model_parameters2,
                                                                  modelclass2)
                 self._process_sequential_fitting_results(key + '_' + str(i))
-        if self.write_output is True and hasattr(self, "fit_data"):
-            outfile = open('outfile-sequential.yaml', 'W')
-            yaml.dump(self.fit_data, outfile)
-        elif not hasattr(self, "fit_data"):
+        if self.write_output is True:
+            self._outfile.close()
+            self._outfile = None
+        if not self.fit_data:
             logger.info("There was no file to process")
 
     def _read_data(self, filename):
@@ -598,6 +849,23 @@ class Fitter(object):
         """
 
         filepath = self.directory + filename
+        if self.use_cache:
+            cachefile = filepath + '.npz'
+            # the cache is only valid if the data file is unchanged and
+            # all settings that affect parsing match the ones it was
+            # created with
+            settings = str((self.inputformat, self.ending,
+                            self.skiprows_txt, self.skiprows_trace,
+                            self.trace_b, self.delimiter,
+                            self.minimumFrequency, self.maximumFrequency,
+                            self.current_threshold, self.voltage_threshold,
+                            self.E4980AL_tolerance))
+            if (os.path.exists(cachefile)
+                    and os.path.getmtime(cachefile) >= os.path.getmtime(filepath)):
+                cached = np.load(cachefile)
+                if str(cached['settings']) == settings:
+                    logger.debug("Read %s from cache.", filename)
+                    return True, cached['omega'], cached['z']
         if self.inputformat == 'TXT' and filename.upper().endswith(self.ending.upper()):
             omega, zarray = readin_Data_from_TXT_file(filepath,
                                                       self.skiprows_txt,
@@ -634,6 +902,13 @@ class Fitter(object):
                                   the reason might be that there was no data point that matched
                                   the current_threshold.""".format(filename))
 
+        # hand contiguous arrays of the canonical dtypes to the model
+        # kernels so they never fall back to strided access
+        omega = np.ascontiguousarray(omega, dtype=np.float64)
+        zarray = np.ascontiguousarray(zarray, dtype=np.complex128)
+
+        if self.use_cache:
+            np.savez(cachefile, omega=omega, z=zarray, settings=settings)
         return True, omega, zarray
 
     def _process_fitting_results(self, filename):
@@ -644,13 +919,16 @@ class Fitter(object):
         filename: string
             name of file that is used as key in the output dictionary.
         '''
-        if not hasattr(self, "fit_data"):
-            self.fit_data = {}
-        values = self.fittedValues.best_values
-        for key in values:
-            # conversion into python native type
-            values[key] = float(values[key])
+        # conversion into python native type, in a fresh dict so the
+        # best_values of the fit result are not touched
+        values = {key: float(value)
+                  for key, value in self.fittedValues.best_values.items()}
         self.fit_data[str(filename)] = values
+        if self._outfile is not None:
+            # stream the result instead of dumping everything at the end
+            yaml.dump({str(filename): values}, self._outfile,
+                      Dumper=SafeDumper, default_flow_style=False)
+            self._outfile.flush()
         if self.savemodelresult:
             if not hasattr(self, "model_results"):
                 self.model_results = {}
@@ -664,19 +942,21 @@ class Fitter(object):
         filename: string
             name of file that is used as key in the output dictionary.
         '''
-        if not hasattr(self, "fit_data"):
-            self.fit_data = {}
-        values1 = self.fittedValues1.best_values
-        values2 = self.fittedValues2.best_values
-        # conversion into python native type
-        for key in values1:
-            values1[key] = float(values1[key])
-        for key in values2:
-            values2[key] = float(values2[key])
+        # conversion into python native type, in fresh dicts so the
+        # best_values of the fit results are not touched
+        values1 = {key: float(value)
+                   for key, value in self.fittedValues1.best_values.items()}
+        values2 = {key: float(value)
+                   for key, value in self.fittedValues2.best_values.items()}
 
         self.fit_data[str(filename)] = {}
         self.fit_data[str(filename)]['model1'] = values1
         self.fit_data[str(filename)]['model2'] = values2
+        if self._outfile is not None:
+            yaml.dump({str(filename): self.fit_data[str(filename)]},
+                      self._outfile, Dumper=SafeDumper,
+                      default_flow_style=False)
+            self._outfile.flush()
         if self.savemodelresult:
             if not hasattr(self, "model_results"):
                 self.model_results = {}
@@ -790,7 +1070,8 @@ class Fitter(object):
             params[parameter].set(vary=False)
         return params
 
-    def _fit_data(self, model, parameters, modelclass=None, weights=None, log=True, eps=False):
+    def _fit_data(self, model, parameters, modelclass=None, weights=None, log=True, eps=False,
+                  omega=None, Z=None):
         """Fit data to model.
 
         Wrapper for LMFIT fitting routine.
@@ -807,6 +1088,10 @@ class Fitter(object):
         weights: None or :class:`numpy.ndarray`
             Use weights to fit the data. Default is None (no weighting).
             The weights need to have the same shape as the impedance data.
+        omega: None or :class:`numpy.ndarray`
+            Frequencies to use instead of :attr:`omega` (for parallel runs).
+        Z: None or :class:`numpy.ndarray`
+            Impedance data to use instead of :attr:`Z` (for parallel runs).
 
         Returns
         -------
@@ -815,10 +1100,22 @@ class Fitter(object):
             Result of fit as LMFIT.ModelResult object.
         """
         logger.debug('#################################')
-        logger.debug('fit data to {} model'.format(model._name))
+        logger.debug('fit data to %s model', model._name)
         logger.debug('#################################')
-        # initiate copy of parameters for iterative run
-        params = deepcopy(parameters)
+        if omega is None:
+            omega = self.omega
+        if Z is None:
+            Z = self.Z
+        Zdata = Z
+        # a private copy of the parameters is only needed when the
+        # iterative protocol fixes parameters between rounds; lmfit's
+        # Model.fit deep-copies the parameters itself and run() calls
+        # this method once per data set, so copying here again would
+        # only produce allocator traffic
+        if self.protocol == "Iterative":
+            params = deepcopy(parameters)
+        else:
+            params = parameters
         # initiate empty result
         model_result = None
 
@@ -831,23 +1128,23 @@ class Fitter(object):
                                   to trigger possible iterative scheme.""")
                 pass
         for i in range(iters):
-            logger.debug("#########\nFitting round {}\n#########".format(i + 1))
+            logger.debug("#########\nFitting round %s\n#########", i + 1)
             if i > 0:
                 params = self._fix_parameters(i, modelclass, params,
                                               model_result)
             if log:
-                Z = np.log10(self.Z)
+                Z = np.log10(Zdata)
             elif eps:
-                Z = 1. / (1j * self.omega * params['c0all'] * self.Z)
+                Z = 1. / (1j * omega * params['c0all'] * Zdata)
             else:
-                Z = self.Z
+                Z = Zdata
             max_nfev = None
             if 'max_nfev' in self.solver_kwargs:
                 max_nfev = self.solver_kwargs['max_nfev']
                 tmp_dict = {key: self.solver_kwargs[key] for key in set(list(self.solver_kwargs.keys())) - set(['max_nfev'])}
             else:
                 tmp_dict = self.solver_kwargs
-            model_result = model.fit(Z, params, omega=self.omega,
+            model_result = model.fit(Z, params, omega=omega,
                                      method=self.solvername,
                                      fit_kws=tmp_dict,
                                      weights=weights,
@@ -864,15 +1161,89 @@ class Fitter(object):
             # differently for the various solvers)
             if hasattr(model_result, "message"):
                 if model_result.message is not None:
-                    logger.debug("Solver message: " + model_result.message)
+                    logger.debug("Solver message: %s", model_result.message)
             if hasattr(model_result, "lmdif_message"):
                 if model_result.lmdif_message is not None:
-                    logger.debug("Solver message (leastsq): " + model_result.lmdif_message)
+                    logger.debug("Solver message (leastsq): %s", model_result.lmdif_message)
             if hasattr(model_result, "ampgo_msg"):
                 if model_result.ampgo_msg is not None:
-                    logger.debug("Solver message (ampgo): " + model_result.ampgo_msg)
+                    logger.debug("Solver message (ampgo): %s", model_result.ampgo_msg)
         return model_result
 
+    def _fit_data_direct(self, model, parameters, omega=None, Z=None):
+        """Fit data to model with :func:`scipy.optimize.least_squares`.
+
+        Fast path that skips the LMFIT fitting machinery and hence its
+        per-fit overhead. The free parameters are extracted once, the
+        residual updates only their values and the solution is wrapped
+        into a :class:`lmfit.minimizer.MinimizerResult` carrying
+        `params`, `best_values`, `best_fit` and `message`.
+
+        Parameters
+        ----------
+
+        model: :class:`lmfit.model.Model` or :class:`lmfit.model.CompositeModel`
+            The model to fit to.
+        parameters: :class:`lmfit.parameter.Parameters`
+            The model parameters to be used.
+        omega: None or :class:`numpy.ndarray`
+            Frequencies to use instead of :attr:`omega` (for parallel runs).
+        Z: None or :class:`numpy.ndarray`
+            Impedance data to use instead of :attr:`Z` (for parallel runs).
+
+        Returns
+        -------
+
+        :class:`lmfit.minimizer.MinimizerResult`
+            Result of fit.
+        """
+        if omega is None:
+            omega = self.omega
+        if Z is None:
+            Z = self.Z
+        params = deepcopy(parameters)
+        varnames = [name for name in params if params[name].vary]
+        x0 = np.array([params[name].value for name in varnames])
+        lower = np.array([params[name].min for name in varnames])
+        upper = np.array([params[name].max for name in varnames])
+
+        # split the measured data once: the solver then works on
+        # homogeneous float64 blocks instead of interleaved complex pairs
+        z_re = np.ascontiguousarray(Z.real)
+        z_im = np.ascontiguousarray(Z.imag)
+
+        def residual(x):
+            for name, value in zip(varnames, x):
+                params[name].value = value
+            Z_fit = model.eval(params=params, omega=omega)
+            return np.concatenate((Z_fit.real - z_re, Z_fit.imag - z_im))
+
+        solver_kwargs = dict(self.solver_kwargs)
+        jac = solver_kwargs.pop('jac', '2-point')
+        if jac == '2-point' and model._name in _model_jacobians:
+            jac_fn, jac_params = _model_jacobians[model._name]
+            if varnames == jac_params:
+                def jac(x):
+                    deriv = jac_fn(omega, *x)
+                    return np.concatenate((deriv.real, deriv.imag), axis=1).T
+            else:
+                logger.debug("""Analytic Jacobian not applicable since
+                                not all model parameters vary.""")
+
+        solution = least_squares(residual, x0, bounds=(lower, upper),
+                                 method='trf', jac=jac, **solver_kwargs)
+        for name, value in zip(varnames, solution.x):
+            params[name].value = value
+        result = lmfit.minimizer.MinimizerResult(params=params)
+        result.best_values = {name: float(params[name].value)
+                              for name in params}
+        result.best_fit = model.eval(params=params, omega=omega)
+        result.var_names = varnames
+        result.message = solution.message
+        result.success = solution.success
+        logger.debug("Solver message: %s", solution.message)
+        return result
+
     def get_resistance_capacitance(self):
         self.R_dict = {}
         self.C_dict = {}
@@ -885,7 +1256,7 @@ class Fitter(object):
             # determine number of iterations if more than 1 data set is in file
             if len(self.zarray.shape) > 1:
                 self.iters = self.zarray.shape[0]
-                logger.debug("Number of data sets:" + str(self.iters))
+                logger.debug("Number of data sets:%s", self.iters)
             for i in range(self.iters):
                 self.Z = self.zarray[i]
                 rarray[i], carray[i] = _return_resistance_capacitance(self.omega, self.Z)
@@ -901,14 +1272,14 @@ class Fitter(object):
             # determine number of iterations if more than 1 data set is in file
             if len(self.zarray.shape) > 1:
                 self.iters = self.zarray.shape[0]
-                logger.debug("Number of data sets:" + str(self.iters))
+                logger.debug("Number of data sets:%s", self.iters)
             for i in range(self.iters):
                 self.Z = self.zarray[i]
                 xarray[i] = (1. / self.Z)
             self.Y_dict[key] = xarray
 
     def process_data_from_file(self, filename, model, parameters,
-                               modelclass=None):
+                               modelclass=None, omega=None, Z=None):
         """Fit data from input file to model.
 
         Wrapper for LMFIT fitting routine.
@@ -925,6 +1296,10 @@ class Fitter(object):
             The model parameters to be used.
         modelclass: str, optional
             For an iterative scheme, the modelclass is passed to this function.
+        omega: None or :class:`numpy.ndarray`
+            Frequencies to use instead of :attr:`omega` (for parallel runs).
+        Z: None or :class:`numpy.ndarray`
+            Impedance data to use instead of :attr:`Z` (for parallel runs).
 
         Returns
         -------
@@ -934,15 +1309,24 @@ class Fitter(object):
 
         """
         logger.debug("Going to fit")
+        if omega is None:
+            omega = self.omega
+        if Z is None:
+            Z = self.Z
         weights = None
         if self.weighting == "proportional":
-            weights = 1. / self.Z.real + 1j / self.Z.imag
-        fit_output = self._fit_data(model, parameters, modelclass, log=self.log,
-                                    eps=self.eps, weights=weights)
+            weights = 1. / Z.real + 1j / Z.imag
+        if self.direct:
+            fit_output = self._fit_data_direct(model, parameters,
+                                               omega=omega, Z=Z)
+        else:
+            fit_output = self._fit_data(model, parameters, modelclass, log=self.log,
+                                        eps=self.eps, weights=weights,
+                                        omega=omega, Z=Z)
         if self.log:
             Z_fit = np.power(10, fit_output.best_fit)
         elif self.eps:
-            Z_fit = 1. / (1j * self.omega * fit_output.best_fit * parameters['c0all'])
+            Z_fit = 1. / (1j * omega * fit_output.best_fit * parameters['c0all'])
         else:
             Z_fit = fit_output.best_fit
         logger.debug("Fit successful")
@@ -953,7 +1337,7 @@ class Fitter(object):
             if self.savefig:
                 logger.info("Going to save plot of fit result to file.")
             title = "fit_result_" + filename
-            plot_impedance(self.omega, self.Z, title=title, Z_fit=Z_fit,
+            plot_impedance(omega, Z, title=title, Z_fit=Z_fit,
                            show=self.show, save=self.savefig)
         return fit_output
 
@@ -1036,9 +1420,7 @@ class Fitter(object):
                 res = self.model_results[fits]
                 lnprob = np.swapaxes(res.lnprob, 0, 1)
                 chain = np.swapaxes(res.chain, 0, 1)
-                walker_prob = []
-                for i in range(lnprob.shape[0]):
-                    walker_prob.append(-np.mean(lnprob[i]))
+                walker_prob = -lnprob.mean(axis=1)
                 if show:
                     plt.title("walkers sorted by probability")
                     plt.xlabel("walker")
@@ -1055,9 +1437,9 @@ class Fitter(object):
                     plt.ylabel("difference")
                     plt.plot(differences)
                     plt.show()
-                # numerator with j + 1 since enumerate starts from 0
-                average_differences = [(x - l0) / (j + 1) for j, x
-                                       in enumerate((sorted_fields[1::]))]
+                # numerator index starts from 1 for the second walker
+                average_differences = ((sorted_fields[1:] - l0)
+                                       / np.arange(1, sorted_fields.size))
                 if show:
                     plt.title("average difference between current and first walker")
                     plt.ylabel("average difference")
@@ -1065,13 +1447,13 @@ class Fitter(object):
                     plt.plot(average_differences)
                     plt.show()
 
-                # set cut to the maximum number of walkers
-                cut = len(walker_prob)
-                for i in range(differences.size):
-                    if differences[i] > constant * average_differences[i]:
-                        cut = i
-                        logger.debug("Cut off at walker {}".format(cut))
-                        break
+                # set cut to the maximum number of walkers unless the
+                # threshold is exceeded; argmax yields the first True
+                cut = walker_prob.size
+                exceed = differences > constant * average_differences
+                if exceed.any():
+                    cut = int(exceed.argmax())
+                    logger.debug("Cut off at walker %s", cut)
                 if show:
                     plt.title("Acceptance fractions after clustering")
                     plt.xlabel("walker")
@@ -1183,17 +1565,22 @@ class Fitter(object):
                     ci = self.emcee_conf_interval(modelresult)
                 eval1 = lmfit.Parameters()
                 eval2 = lmfit.Parameters()
+                # collect the interval bounds first and insert them in bulk
+                tuples1 = []
+                tuples2 = []
                 for p in modelresult.params:
                     if p == "__lnsigma":
                         continue
-                    eval1.add(p, value=modelresult.best_values[p])
-                    eval2.add(p, value=modelresult.best_values[p])
+                    value1 = value2 = modelresult.best_values[p]
                     if p in ci:
-                        eval1[p].set(value=ci[p][3 - sigma][1])
-                        eval2[p].set(value=ci[p][3 + sigma][1])
-
-                Z1 = modelresult.eval(params=eval1)
-                Z2 = modelresult.eval(params=eval2)
+                        value1 = ci[p][3 - sigma][1]
+                        value2 = ci[p][3 + sigma][1]
+                    tuples1.append((p, value1))
+                    tuples2.append((p, value2))
+                eval1.add_many(*tuples1)
+                eval2.add_many(*tuples2)
+
+                Z1, Z2 = _eval_uncertainty_interval(modelresult, eval1, eval2)
                 Z = modelresult.best_fit
                 plot_uncertainty(modelresult.userkws['omega'], modelresult.data,
                                  Z, Z1, Z2, sigma, model=i)
@@ -1233,18 +1620,14 @@ class Fitter(object):
                      as a solver to use this function""")
             return
 
-        ci = {}
-        percentiles = [.5 * (1.0 - 0.9973002039367398),
-                       .5 * (1.0 - 0.9544997361036416),
-                       .5 * (1.0 - 0.6826894921370859),
-                       .5,
-                       .5 * (1.0 + 0.6826894921370859),
-                       .5 * (1.0 + 0.9544997361036416),
-                       .5 * (1.0 + 0.9973002039367398)]
+        percentiles = _SIGMA_PERCENTILES
         pars = [p for p in result.params if result.params[p].vary]
-        for i, p in enumerate(pars):
-            quantile = np.percentile(result.flatchain[p], np.array(percentiles) * 100)
-            ci[p] = list(zip(percentiles, quantile))
+        # one percentile call over the stacked chain partitions the
+        # samples once for all parameters
+        chain = result.flatchain[pars].to_numpy()
+        quantiles = np.percentile(chain, np.array(percentiles) * 100, axis=0)
+        ci = {p: list(zip(percentiles, quantiles[:, i]))
+              for i, p in enumerate(pars)}
         return ci
 
     def prepare_emcee_run(self, leastsquaresresult,
@@ -1401,7 +1784,7 @@ class Fitter(object):
             # determine number of iterations if more than 1 data set is in file
             if len(self.zarray.shape) > 1:
                 self.iters = self.zarray.shape[0]
-                logger.debug("Number of data sets:" + str(self.iters))
+                logger.debug("Number of data sets:%s", self.iters)
             if self.data_sets is not None:
                 self.iters = self.data_sets
                 logger.debug("""Will only iterate
@@ -1624,7 +2007,7 @@ class Fitter(object):
                 logger.warning("Reached maximum number of RC elements.")
                 break
 
-        logger.debug("\nmu = {}, c = {}\n".format(mu, c))
+        logger.debug("\nmu = %s, c = %s\n", mu, c)
 
         fitresult = {'R': b[0]}
 
@@ -1657,10 +2040,45 @@ class Fitter(object):
             fitresult['R_' + str(0)] = rks[0]
             fitresult['tau_' + str(0)] = tau_max
 
-        logger.info("Used M={} RC elements.".format(M))
+        logger.info("Used M=%s RC elements.", M)
         return fitresult, mus, res
 
 
+def _eval_uncertainty_interval(modelresult, eval1, eval2):
+    """Evaluate the lower and upper uncertainty parameter sets.
+
+    The two parameter vectors are stacked and the underlying model
+    function is called once with broadcasting, which halves the
+    evaluation overhead. Composite circuits and model functions that
+    only take scalar parameters fall back to two regular evaluations.
+
+    Parameters
+    ----------
+    modelresult: :class:`lmfit.model.ModelResult`
+        Result from fit.
+    eval1: :class:`lmfit.parameter.Parameters`
+        Parameters at the lower confidence limit.
+    eval2: :class:`lmfit.parameter.Parameters`
+        Parameters at the upper confidence limit.
+
+    Returns
+    -------
+    tuple of :class:`numpy.ndarray`, complex
+        Impedances of the lower and upper parameter set.
+    """
+    model = modelresult.model
+    omega = modelresult.userkws['omega']
+    try:
+        stacked = {name: np.array([[eval1[name].value], [eval2[name].value]])
+                   for name in model.param_names}
+        Z = model.func(omega[None, :], **stacked)
+        if np.shape(Z) == (2, omega.size):
+            return Z[0], Z[1]
+    except Exception:
+        logger.debug("Batched uncertainty evaluation not possible.")
+    return modelresult.eval(params=eval1), modelresult.eval(params=eval2)
+
+
 def _compute_mu(fit_values):
     r"""compute mu from Rk values
 
@@ -16,6 +16,13 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
+
+import matplotlib
+# force the non-interactive Agg backend for batch analyses, where the
+# GUI event-loop setup of an interactive backend only costs time
+if os.environ.get("IMPEDANCEFITTER_HEADLESS"):
+    matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import numpy as np
 import corner
@@ -125,7 +132,13 @@ def plot_dielectric_properties(omega, Z, c0, Z_comp=None, title="", show=True, s
         Decide if you want to show plot or add line to existing plot.
 
     '''
-    eps_r, cond_fit = return_diel_properties(omega, Z, c0)
+    if Z_comp is not None:
+        # stack both spectra and convert them in a single broadcast call
+        eps_both, cond_both = return_diel_properties(omega, np.stack((Z, Z_comp)), c0)
+        eps_r, eps_r2 = eps_both
+        cond_fit, cond_fit2 = cond_both
+    else:
+        eps_r, cond_fit = return_diel_properties(omega, Z, c0)
 
     axes = []
     plt.figure("dielectricproperties")
@@ -140,8 +153,6 @@ def plot_dielectric_properties(omega, Z, c0, Z_comp=None, title="", show=True, s
     if labels is None:
         labels = [r'$Z_1$', r'$Z_2$']
     assert len(labels) == 2, "You need to provide lables as a list containing 2 strings!"
-    if Z_comp is not None:
-        eps_r2, cond_fit2 = return_diel_properties(omega, Z_comp, c0)
     plt.title("Relative permittivity")
     plt.ylabel("Relative permittivity")
     plt.xlabel('Frequency / Hz')
@@ -636,23 +647,35 @@ def plot_compare_to_data(omega, Z, Z_fit, subplot=None, title="", show=True, sav
     else:
         show = False
         plt.subplot(subplot)
+    # compute the complex difference once and derive all curves from it,
+    # using in-place ops to keep the number of temporaries low
+    diff = Z - Z_fit
     if residual == "parts":
-        close_to_zero_real = np.where(np.isclose(Z.real, 0., atol=impedance_threshold))
-        close_to_zero_imag = np.where(np.isclose(Z.imag, 0., atol=impedance_threshold))
-        diff_real = 100. * (Z.real - Z_fit.real) / Z.real
-        diff_imag = 100. * (Z.imag - Z_fit.imag) / Z.imag
-        diff_real[close_to_zero_real] = np.nan
-        diff_imag[close_to_zero_imag] = np.nan
-        diff_abs = 100. * np.abs((Z - Z_fit) / Z)
+        diff_abs = np.abs(diff)
+        diff_abs /= np.abs(Z)
+        diff_abs *= 100.
+        # mask impedances close to zero directly in the division instead
+        # of sanitizing afterwards; the untouched entries stay NaN
+        diff_real = np.full_like(diff_abs, np.nan)
+        np.divide(diff.real, Z.real, out=diff_real,
+                  where=~np.isclose(Z.real, 0., atol=impedance_threshold))
+        diff_real *= 100.
+        diff_imag = np.full_like(diff_abs, np.nan)
+        np.divide(diff.imag, Z.imag, out=diff_imag,
+                  where=~np.isclose(Z.imag, 0., atol=impedance_threshold))
+        diff_imag *= 100.
         label = 'Relative difference / %'
     elif residual == "absolute":
-        diff_real = 100. * (Z.real - Z_fit.real) / np.abs(Z)
-        diff_imag = 100. * (Z.imag - Z_fit.imag) / np.abs(Z)
+        absZ = np.abs(Z)
+        diff_real = np.divide(diff.real, absZ)
+        diff_real *= 100.
+        diff_imag = np.divide(diff.imag, absZ)
+        diff_imag *= 100.
         label = 'Relative difference / %'
     elif residual == "diff":
-        diff_real = Z.real - Z_fit.real
-        diff_imag = Z.imag - Z_fit.imag
-        diff_abs = np.abs(Z - Z_fit)
+        diff_real = diff.real
+        diff_imag = diff.imag
+        diff_abs = np.abs(diff)
         label = r"Difference / $\Omega$"
     else:
         raise RuntimeError("""residual must be either `parts`, `absolute` or `diff`,
@@ -22,6 +22,11 @@ from math import ceil
 import openturns as ot
 from openturns.viewer import View
 import yaml
+# use the libyaml C parser when it is available
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 from .utils import get_labels
 import logging
 
@@ -52,7 +57,7 @@ class PostProcess(object):
             self.data = fitresult
         elif yamlfile is not None and fitresult is None:
             with open(yamlfile, 'r') as fitfile:
-                self.data = yaml.safe_load(fitfile)
+                self.data = yaml.load(fitfile, Loader=SafeLoader)
         else:
             raise RuntimeError("Provide either yamlfile or fitresult.")
         assert isinstance(self.data, dict),\
@@ -61,20 +66,23 @@ class PostProcess(object):
         random_key = next(iter(self.data))
         self.parameters = list(self.data[random_key].keys())
         self.labels = get_labels(self.parameters)
-        # write data into dict
+        # write data into dict; collect all values in a single pass over
+        # the data instead of one full pass per parameter
+        try:
+            values_matrix = np.array([[values[p] for p in self.parameters]
+                                      for values in self.data.values()],
+                                     dtype=float)
+        except KeyError:
+            print("""There must be all parameters present
+                     over the entire data set you want to analyse.""")
+            raise
         self.sampledict = {}
-        for p in self.parameters:
-            plist = []
-            for values in self.data.values():
-                try:
-                    plist.append([values[p]])
-                except KeyError:
-                    print("""There must be all parameters present
-                             over the entire data set you want to analyse.""")
-            if np.all(np.isclose(plist, plist[0])):
-                logger.info("All values for parameter {} are equal. Parameter will be neglected since it was kept constant.".format(p))
+        for i, p in enumerate(self.parameters):
+            column = values_matrix[:, i]
+            if np.all(np.isclose(column, column[0])):
+                logger.info("All values for parameter %s are equal. Parameter will be neglected since it was kept constant.", p)
                 continue
-            self.sampledict[p] = ot.Sample(np.array(plist))
+            self.sampledict[p] = ot.Sample(column.reshape(-1, 1))
         self.parameters = list(self.sampledict.keys())
 
     def plot_histograms(self, savefig=False, show=True):
@@ -210,7 +218,7 @@ class PostProcess(object):
         sample = self.sampledict[parameter]
         tested_distributions = []
         for dist in distributions:
-            tested_distributions.append(eval("ot." + dist + "Factory()"))
+            tested_distributions.append(getattr(ot, dist + "Factory")())
         best_model, best_result = ot.FittingTest.BestModelKolmogorov(sample, tested_distributions)
         logger.debug("Best model:")
         logger.debug(best_model)
@@ -248,7 +256,7 @@ class PostProcess(object):
         sample = self.sampledict[parameter]
         tested_distributions = []
         for dist in distributions:
-            tested_distributions.append(eval("ot." + dist + "Factory()"))
+            tested_distributions.append(getattr(ot, dist + "Factory")())
         best_model, best_result = ot.FittingTest.BestModelBIC(sample, tested_distributions)
         logger.debug("Best model:")
         logger.debug(best_model)
@@ -285,7 +293,7 @@ class PostProcess(object):
         sample = self.sampledict[parameter]
         tested_distributions = []
         for dist in distributions:
-            tested_distributions.append(eval("ot." + dist + "Factory()"))
+            tested_distributions.append(getattr(ot, dist + "Factory")())
         best_model, best_result = ot.FittingTest.BestModelChiSquared(sample, tested_distributions)
         logger.debug("Best model:")
         logger.debug(best_model)
@@ -52,7 +52,7 @@ def readin_Data_from_collection(filepath, fileformat, minimumFrequency=None, max
     zarray:  :class:`numpy.ndarray`
         Contains collection of impedance spectra. Has shape (number of spectra, number of frequencies).
     """
-    logger.info('going to process file: ' + filepath)
+    logger.info('going to process file: %s', filepath)
     if fileformat == 'XLSX':
         EIS = pd.read_excel(filepath)
     elif fileformat == 'CSV':
@@ -70,8 +70,8 @@ def readin_Data_from_collection(filepath, fileformat, minimumFrequency=None, max
         minimumFrequency = values[0, 0]
     if maximumFrequency is None:
         maximumFrequency = values[-1, 0]
-    logger.info("minimumFrequency is {}".format(minimumFrequency))
-    logger.info("maximumFrequency is {}".format(maximumFrequency))
+    logger.info("minimumFrequency is %s", minimumFrequency)
+    logger.info("maximumFrequency is %s", maximumFrequency)
 
     for i in range(values.shape[0]):
         if np.greater_equal(values[i, 0], minimumFrequency):
@@ -131,7 +131,7 @@ def readin_Data_from_csv_E4980AL(filepath, minimumFrequency=None, maximumFrequen
         Contains collection of impedance spectra. Has shape (1, number of frequencies).
 
     """
-    logger.info('going to process csv file: ' + filepath)
+    logger.info('going to process csv file: %s', filepath)
     EIS = pd.read_csv(filepath)
     tmp = EIS.values
     values = tmp[tmp[:, 0].argsort()]  # need to sort frequencies
@@ -164,8 +164,8 @@ def readin_Data_from_csv_E4980AL(filepath, minimumFrequency=None, maximumFrequen
     omega = 2. * np.pi * f
 
     if f.size > 0:
-        logger.info("minimumFrequency is {}".format(f.min()))
-        logger.info("maximumFrequency is {}".format(f.max()))
+        logger.info("minimumFrequency is %s", f.min())
+        logger.info("maximumFrequency is %s", f.max())
 
     # construct complex-valued array from float data
     zarray = np.zeros((np.int((values.shape[1] - 1) / 2), values.shape[0]), dtype=np.complex128)
@@ -190,7 +190,7 @@ def _get_max_rows(filepath, trace_b, skiprows_txt, skiprows_trace):
     txt_file.close()
     if max_rows < 0:
         raise RuntimeError("Could not process TXT file, second trace could not be found")
-    logger.debug('number of rows per trace is: ' + str(max_rows))
+    logger.debug('number of rows per trace is: %s', max_rows)
     return max_rows
 
 
@@ -228,7 +228,7 @@ def readin_Data_from_TXT_file(filepath, skiprows_txt, skiprows_trace=None,
         Contains collection of impedance spectra. Has shape (1, number of frequencies).
 
     """
-    logger.info('going to process  text file: ' + filepath)
+    logger.info('going to process  text file: %s', filepath)
     max_rows = None  # numpy default
     if trace_b is not None:
         max_rows = _get_max_rows(filepath, trace_b, skiprows_txt, skiprows_trace)
@@ -237,15 +237,15 @@ def readin_Data_from_TXT_file(filepath, skiprows_txt, skiprows_trace=None,
         fileDataArray = np.loadtxt(txt_file, delimiter=delimiter,
                                    skiprows=skiprows_txt, max_rows=max_rows)
     except ValueError as v:
-        logger.error('Error in file {}.\n {}'.format(filepath, v.args))
+        logger.error('Error in file %s.\n %s', filepath, v.args)
         raise
     filteredvalues = np.empty((0, fileDataArray.shape[1]))
     if minimumFrequency is None:
         minimumFrequency = fileDataArray[0, 0].astype(np.float)
-        logger.info("minimumFrequency is {}".format(minimumFrequency))
+        logger.info("minimumFrequency is %s", minimumFrequency)
     if maximumFrequency is None:
         maximumFrequency = fileDataArray[-1, 0].astype(np.float)
-        logger.info("maximumFrequency is {}".format(maximumFrequency))
+        logger.info("maximumFrequency is %s", maximumFrequency)
     for i in range(fileDataArray.shape[0]):
         if (np.greater_equal(fileDataArray[i, 0], minimumFrequency)
                and np.less_equal(fileDataArray[i, 0], maximumFrequency)):
@@ -288,7 +288,7 @@ def readin_Data_from_dta(filepath, minimumFrequency=None, maximumFrequency=None)
         Contains collection of impedance spectra. Has shape (1, number of frequencies).
 
     """
-    logger.info('going to process DTA file: ' + filepath)
+    logger.info('going to process DTA file: %s', filepath)
     with open(filepath, encoding='utf-8', errors='ignore') as w:
         lines = w.readlines()
     index = lines.index("ZCURVE\tTABLE\n")
@@ -325,8 +325,8 @@ def readin_Data_from_dta(filepath, minimumFrequency=None, maximumFrequency=None)
     omega = 2. * np.pi * f
 
     if f.size > 0:
-        logger.info("minimumFrequency is {}".format(f.min()))
-        logger.info("maximumFrequency is {}".format(f.max()))
+        logger.info("minimumFrequency is %s", f.min())
+        logger.info("maximumFrequency is %s", f.max())
 
     # construct complex-valued array from float data
     zarray = np.zeros((np.int((values.shape[1] - 1) / 2), values.shape[0]), dtype=np.complex128)
@@ -18,6 +18,34 @@
 
 
 from scipy.constants import epsilon_0 as e0
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _single_shell_kernel(omega, em, km, kcp, ecp, kmed, emed, p, c0, v1):
+        """Compiled single-shell loop, fusing the elementwise arithmetic."""
+        Z = np.empty(omega.size, dtype=np.complex128)
+        for i in range(omega.size):
+            w = omega[i]
+            epsi_cp = complex(ecp, -kcp / (e0 * w))
+            epsi_m = complex(em, -km / (e0 * w))
+            epsi_med = complex(emed, -kmed / (e0 * w))
+            E1 = epsi_cp / epsi_m
+            epsi_cell = epsi_m * (2. * (1. - v1) + (1. + 2. * v1) * E1) / ((2. + v1) + (1. - v1) * E1)
+            esus = epsi_med * (((2. * epsi_med + epsi_cell) - 2. * p * (epsi_med - epsi_cell))
+                               / ((2. * epsi_med + epsi_cell) + p * (epsi_med - epsi_cell)))
+            Z[i] = 1. / (1j * esus * w * c0)
+        return Z
+
+    # warm the cache at import so the first fit does not pay for compilation
+    _single_shell_kernel(np.ones(1), 7.9, 5e-17, 0.5, 60., 0.1, 80., 0.1, 1e-12, 0.99)
 
 
 def single_shell_model(omega, em, km, kcp, ecp, kmed, emed, p, c0, dm, Rc):
@@ -111,6 +139,12 @@ def single_shell_model(omega, em, km, kcp, ecp, kmed, emed, p, c0, dm, Rc):
 
     v1 = (1. - dm / Rc)**3
 
+    if NUMBA_AVAILABLE and isinstance(omega, np.ndarray) and omega.ndim == 1:
+        omega = np.ascontiguousarray(omega, dtype=np.float64)
+        return _single_shell_kernel(omega, float(em), float(km), float(kcp),
+                                    float(ecp), float(kmed), float(emed),
+                                    float(p), float(c0), float(v1))
+
     epsi_cp = ecp - 1j * kcp / (e0 * omega)
     epsi_m = em - 1j * km / (e0 * omega)
     epsi_med = emed - 1j * kmed / (e0 * omega)
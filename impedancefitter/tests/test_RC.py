@@ -1,7 +1,10 @@
-from impedancefitter.RC import rc_model, RC_model, drc_model, rc_tau_model
+from impedancefitter.RC import (rc_model, RC_model, RC_model_batch, RC_model_jac,
+                                RC_model_float32, drc_model, rc_tau_model,
+                                fit_RC_model)
 from impedancefitter.cole_cole import cole_cole_R_model
 from scipy.constants import epsilon_0 as e0
 import numpy as np
+import pytest
 omega = 2. * np.pi * np.logspace(1, 8, num=20)
 
 # for RCfull
@@ -81,6 +84,79 @@ def test_RCtau_shape():
     assert Z.shape == omega.shape
 
 
+def test_RCbatch_shape():
+    Rds = np.array([Rd, 2. * Rd])
+    Cds = np.array([Cd, 2. * Cd])
+    Z = RC_model_batch(omega, Rds, Cds)
+    assert Z.shape == (2, omega.size)
+
+
+def test_equality_RCbatch_RCfull():
+    Rds = np.array([Rd, 2. * Rd])
+    Cds = np.array([Cd, 2. * Cd])
+    Z = RC_model_batch(omega, Rds, Cds)
+    for i in range(2):
+        assert np.all(np.isclose(Z[i], RC_model(omega, Rds[i], Cds[i])))
+
+
+def test_RCjac_shape():
+    jac = RC_model_jac(omega, Rd, Cd)
+    assert jac.shape == (2, omega.size)
+
+
+def test_RCjac_finite_differences():
+    jac = RC_model_jac(omega, Rd, Cd)
+    hR = 1e-6 * Rd
+    hC = 1e-6 * Cd
+    fd_Rd = (RC_model(omega, Rd + hR, Cd) - RC_model(omega, Rd - hR, Cd)) / (2. * hR)
+    fd_Cd = (RC_model(omega, Rd, Cd + hC) - RC_model(omega, Rd, Cd - hC)) / (2. * hC)
+    assert np.all(np.isclose(jac[0], fd_Rd))
+    assert np.all(np.isclose(jac[1], fd_Cd))
+
+
+def test_RCfull_scalar():
+    Z = RC_model(float(omega[0]), Rd, Cd)
+    assert isinstance(Z, complex)
+    assert np.isclose(Z, RC_model(omega, Rd, Cd)[0])
+
+
+def test_RCfull_strided():
+    strided = np.repeat(omega, 2)[::2]
+    assert not strided.flags.c_contiguous
+    Z = RC_model(strided, Rd, Cd)
+    assert np.all(np.isclose(Z, RC_model(omega, Rd, Cd)))
+
+
+def test_RCfull_float32():
+    Z = RC_model_float32(omega, Rd, Cd)
+    assert Z.dtype == np.complex64
+    assert np.all(np.isclose(Z, RC_model(omega, Rd, Cd), rtol=1e-4))
+
+
+def test_fit_RC_model():
+    Z = RC_model(omega, Rd, Cd)
+    result = fit_RC_model(omega, Z, 0.5 * Rd, 2. * Cd)
+    assert np.isclose(result.x[0], Rd)
+    assert np.isclose(result.x[1], Cd)
+
+
+def test_fit_RC_model_weighted():
+    Z = RC_model(omega, Rd, Cd)
+    result = fit_RC_model(omega, Z, 0.5 * Rd, 2. * Cd, weighting="modulus")
+    assert np.isclose(result.x[0], Rd)
+    assert np.isclose(result.x[1], Cd)
+
+
+def test_RC_ufunc_broadcasting():
+    pytest.importorskip("numba")
+    from impedancefitter import RC
+    Rds = np.array([float(Rd), 2. * Rd])
+    Cds = np.array([float(Cd), 2. * Cd])
+    Z = RC.RC_model_ufunc(omega[None, :], Rds[:, None], Cds[:, None])
+    assert Z.shape == (2, omega.size)
+    assert np.all(np.isclose(Z, RC_model_batch(omega, Rds, Cds)))
+
+
 def test_equality_rc_rc_tau():
     Z_rc = RC_model(omega, Rd, Cd)
     Z_tau = rc_tau_model(omega, Rd, tauk)
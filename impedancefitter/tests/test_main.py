@@ -2,6 +2,7 @@ import os
 import pytest
 import numpy as np
 import pandas as pd
+import yaml
 from collections import OrderedDict
 from impedancefitter import Fitter, get_equivalent_circuit_model
 
@@ -68,6 +69,106 @@ def test_run(fitter):
     assert hasattr(fitter, "fit_data")
 
 
+def test_run_direct(fitter):
+    parameters = {'R': {'value': R},
+                  'C': {'value': C}}
+
+    fitter.run(model, parameters=parameters, direct=True)
+    assert hasattr(fitter, "fit_data")
+    for key in fitter.fit_data:
+        assert np.isclose(fitter.fit_data[key]['R'], R, rtol=0.2)
+        assert np.isclose(fitter.fit_data[key]['C'], C, rtol=0.2)
+
+
+def test_run_batch(fitter):
+    parameters = {'R': {'value': R},
+                  'C': {'value': C}}
+
+    fitter.run_batch(model, parameters=parameters)
+    assert hasattr(fitter, "fit_data")
+    assert len(fitter.fit_data) == 1
+    for key in fitter.fit_data:
+        assert np.isclose(fitter.fit_data[key]['R'], R, rtol=0.2)
+        assert np.isclose(fitter.fit_data[key]['C'], C, rtol=0.2)
+
+
+def test_stack_data(fitter):
+    fitter.stack_data()
+    assert len(fitter.Z_blocks) == 1
+    assert fitter.Z_blocks[0].shape == (5, fitter.omega_blocks[0].size)
+    assert fitter.Z_blocks[0].flags.c_contiguous
+    assert fitter.block_indices[0][0] == ('test.csv', 0)
+
+
+def test_write_output(fitter):
+    parameters = {'R': {'value': R},
+                  'C': {'value': C}}
+
+    fitter.write_output = True
+    fitter.run(model, parameters=parameters)
+    assert os.path.exists('outfile.yaml')
+    with open('outfile.yaml') as outfile:
+        output = yaml.safe_load(outfile)
+    assert len(output) == 5
+    for key in fitter.fit_data:
+        assert np.isclose(output[key]['R'], fitter.fit_data[key]['R'])
+    os.remove('outfile.yaml')
+
+
+def test_use_cache():
+    f = np.logspace(1, 8)
+    omega = 2. * np.pi * f
+
+    data = OrderedDict()
+    data['f'] = f
+    m = get_equivalent_circuit_model(model)
+    Z = m.eval(omega=omega, R=R, C=C)
+    data['real'] = Z.real
+    data['imag'] = Z.imag
+    pd.DataFrame(data=data).to_csv('test.csv', index=False)
+
+    fitter = Fitter('CSV', LogLevel='WARNING', use_cache=True)
+    assert os.path.exists('test.csv.npz')
+    fitter_cached = Fitter('CSV', LogLevel='WARNING', use_cache=True)
+    assert np.all(np.isclose(fitter.z_dict['test.csv'],
+                             fitter_cached.z_dict['test.csv']))
+    os.remove('test.csv')
+    os.remove('test.csv.npz')
+
+
+def test_run_direct_jacobian():
+    f = np.logspace(1, 8)
+    omega = 2. * np.pi * f
+    Rd = 100.
+    Cd = 1e6
+
+    data = OrderedDict()
+    data['f'] = f
+    m = get_equivalent_circuit_model("RCfull")
+    Z = m.eval(omega=omega, Rd=Rd, Cd=Cd)
+    data['real'] = Z.real
+    data['imag'] = Z.imag
+    pd.DataFrame(data=data).to_csv('test.csv', index=False)
+
+    fitter = Fitter('CSV', LogLevel='WARNING')
+    os.remove('test.csv')
+    parameters = {'Rd': {'value': 0.5 * Rd},
+                  'Cd': {'value': 2. * Cd}}
+    fitter.run("RCfull", parameters=parameters, direct=True)
+    for key in fitter.fit_data:
+        assert np.isclose(fitter.fit_data[key]['Rd'], Rd)
+        assert np.isclose(fitter.fit_data[key]['Cd'], Cd)
+
+
+def test_run_parallel(fitter):
+    parameters = {'R': {'value': R},
+                  'C': {'value': C}}
+
+    fitter.run(model, parameters=parameters, n_jobs=2)
+    assert hasattr(fitter, "fit_data")
+    assert len(fitter.fit_data) == 5
+
+
 @pytest.fixture
 def fitter2():
     f = np.logspace(1, 8)
@@ -17,8 +17,22 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import os
+
 import numpy as np
 import yaml
+# use the libyaml C parser when it is available
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 import pyparsing as pp
 import re
 # to make it compatible with Python >= 3.7
@@ -30,7 +44,7 @@ except ImportError:
     import schemdraw.elements as elm
 
 from scipy.integrate import simps
-from collections import Counter
+from collections import Counter, namedtuple
 from scipy.constants import epsilon_0 as e0
 from .elements import Z_C, Z_stray, log, parallel, Z_R, Z_L, Z_w, Z_ws, Z_wo, eps
 from .loss import Z_in, Z_loss, Z_skin
@@ -42,18 +56,59 @@ from .cpe import cpe_model, cpe_ct_model, cpe_ct_w_model, cpe_onset_model, cpeti
 from .single_shell import single_shell_model
 from lmfit import Model, CompositeModel
 from copy import deepcopy
+from functools import lru_cache
 from packaging import version
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _load_yaml_cached(path, mtime):
+    """Parse a YAML file, cached on path and modification time.
+
+    The `mtime` argument is only part of the cache key: it invalidates
+    the cached parse when the file changes on disk. Callers must copy
+    the returned dictionary before mutating it.
+    """
+    # read the whole file in one go; for the small parameter files the
+    # stream-based read costs more than the actual parse
+    with open(path, 'rb') as infile:
+        data = infile.read()
+    return yaml.load(data, Loader=SafeLoader)
+
+
+# result type of return_diel_properties; behaves like a plain tuple but
+# also allows access by attribute
+DielectricProperties = namedtuple('DielectricProperties',
+                                  ['eps_r', 'conductivity'])
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _diel_properties_kernel(omega, Z, c0, eps_r, conductivity):
+        """Fused impedance-to-dielectric-properties loop.
+
+        Fills `eps_r` and `conductivity` in a single pass without
+        materialising the full complex permittivity array.
+        """
+        for i in range(omega.size):
+            epsc = 1. / (1j * omega[i] * Z[i] * c0)
+            eps_r[i] = epsc.real
+            conductivity[i] = -epsc.imag * e0 * omega[i]
+
+    # warm the cache at import so the first conversion does not pay for
+    # compilation
+    _diel_properties_kernel(np.ones(1), np.ones(1, dtype=np.complex128),
+                            1., np.empty(1), np.empty(1))
+
+
 def convert_diel_properties_to_impedance(omega, eps, sigma, c0):
     epsc = omega * eps - 1j * sigma / e0
     return 1. / (1j * epsc * c0)
 
 
-def return_diel_properties(omega, Z, c0):
+def return_diel_properties(omega, Z, c0, out=None):
     r"""Return relative permittivity and conductivity
     from impedance spectrum in cavity with known unit capacitance.
 
@@ -98,14 +153,19 @@ def return_diel_properties(omega, Z, c0):
         impedance array
     c0: double
         unit capacitance of device
+    out: tuple of :class:`numpy.ndarray`, double, optional
+        pair of preallocated real-valued arrays `(eps_r, conductivity)`
+        the result is written into. Lets callers that convert many
+        spectra of the same length reuse the buffers instead of
+        allocating two arrays per call.
 
     Returns
     -------
 
-    eps_r: :class:`numpy.ndarray`, double
-        relative permittivity
-    conductivity: :class:`numpy.ndarray`, double
-        conductivity in S/m
+    :class:`DielectricProperties`
+        named tuple `(eps_r, conductivity)` with the relative
+        permittivity and the conductivity in S/m; unpacks like the
+        plain tuple returned previously
 
     References
     ----------
@@ -113,10 +173,29 @@ def return_diel_properties(omega, Z, c0):
     .. [Grant1958] Grant, F. A. (1958). Use of complex conductivity in the representation of dielectric phenomena.
            Journal of Applied Physics, 29(1), 76–80. https://doi.org/10.1063/1.1722949
     """
+    if (NUMBA_AVAILABLE and isinstance(omega, np.ndarray)
+            and isinstance(Z, np.ndarray) and omega.ndim == 1
+            and Z.shape == omega.shape):
+        omega = np.ascontiguousarray(omega, dtype=np.float64)
+        Z = np.ascontiguousarray(Z, dtype=np.complex128)
+        if out is not None:
+            eps_r, conductivity = out
+        else:
+            eps_r = np.empty(omega.size)
+            conductivity = np.empty(omega.size)
+        _diel_properties_kernel(omega, Z, float(c0), eps_r, conductivity)
+        return DielectricProperties(eps_r, conductivity)
     epsc = 1. / (1j * omega * Z * c0)
-    eps_r = epsc.real
-    conductivity = -epsc.imag * e0 * omega
-    return eps_r, conductivity
+    if out is not None:
+        eps_r, conductivity = out
+        np.copyto(eps_r, epsc.real)
+        np.multiply(epsc.imag, -e0, out=conductivity)
+    else:
+        eps_r = epsc.real
+        # scale in place to avoid a second full-length temporary
+        conductivity = np.multiply(epsc.imag, -e0)
+    conductivity *= omega
+    return DielectricProperties(eps_r, conductivity)
 
 
 def check_parameters(bufdict):
@@ -157,56 +236,59 @@ def check_parameters(bufdict):
         if par in exceptions:
             continue
 
+        # bind the Parameter object once instead of looking it up per check
+        param = bufdict[p]
+
         if par in capacitancespF:
-            assert not np.isclose(bufdict[p].value, 0.0, atol=1e-5),\
+            assert not np.isclose(param.value, 0.0, atol=1e-5),\
                 """{} is used in pF, do you really want it to be that small?
                    It will be ignored in the analysis""".format(p)
 
         if par in zerotoones:
-            assert 0 <= bufdict[p].value <= 1.0,\
+            assert 0 <= param.value <= 1.0,\
                 """{} is an exponent or the volume fraction that needs to be between 0.0 and 1.0.
                    Change your initial value.""".format(p)
-            if bufdict[p].vary:
-                if bufdict[p].min < 0.0 or bufdict[p].min > 1.0:
-                    logger.debug("""{} is an exponent that needs to be between
-                                   0.0 and 1.0. Changed your min value to 0.""".format(p))
-                    bufdict[p].set(min=0.0)
-                if bufdict[p].max > 1.0:
-                    logger.debug("""{} is an exponent that needs to be between 0.0 and 1.0.
-                                   Changed your max value to 1.0.""".format(p))
-                    bufdict[p].set(max=1.0)
+            if param.vary:
+                if param.min < 0.0 or param.min > 1.0:
+                    logger.debug("""%s is an exponent that needs to be between
+                                   0.0 and 1.0. Changed your min value to 0.""", p)
+                    param.set(min=0.0)
+                if param.max > 1.0:
+                    logger.debug("""%s is an exponent that needs to be between 0.0 and 1.0.
+                                   Changed your max value to 1.0.""", p)
+                    param.set(max=1.0)
             continue
 
         if par in taus:
-            assert not np.isclose(bufdict[p].value, 0.0, atol=1e-7),\
+            assert not np.isclose(param.value, 0.0, atol=1e-7),\
                 "tau is used in ns, do you really want it to be that small?"
 
         # check permittivities
         if par in permittivities:
-            assert bufdict[p].value >= 1.0,\
+            assert param.value >= 1.0,\
                 """The permittivity {} needs to be greater than
                    or equal to 1. Change the initial value.""".format(p)
-            if bufdict[p].vary:
-                if bufdict[p].min < 1.0:
-                    logger.debug("""The permittivity {} needs to be greater
-                                   than or equal to 1. Changed the min value to 1.""".format(p))
-                    bufdict[p].set(min=1.0)
-                if bufdict[p].max < 1.0:
-                    logger.debug("""The permittivity {} needs to be greater than
-                                   or equal to 1. Changed the max value to inf.""".format(p))
-                    bufdict[p].set(max=np.inf)
+            if param.vary:
+                if param.min < 1.0:
+                    logger.debug("""The permittivity %s needs to be greater
+                                   than or equal to 1. Changed the min value to 1.""", p)
+                    param.set(min=1.0)
+                if param.max < 1.0:
+                    logger.debug("""The permittivity %s needs to be greater than
+                                   or equal to 1. Changed the max value to inf.""", p)
+                    param.set(max=np.inf)
             continue
 
-        if bufdict[p].vary:
-            if bufdict[p].min < 0.0:
-                logger.debug("{} needs to be positive. Changed your min value to 0.".format(p))
-                bufdict[p].set(min=0.0)
+        if param.vary:
+            if param.min < 0.0:
+                logger.debug("%s needs to be positive. Changed your min value to 0.", p)
+                param.set(min=0.0)
                 if par in capacitances:
                     # to avoid division by zero
-                    bufdict[p].set(min=1e-12)
-            if bufdict[p].max < 0.0:
-                logger.debug("{} needs to be positive. Changed your max value to inf.".format(p))
-                bufdict[p].set(max=np.inf)
+                    param.set(min=1e-12)
+            if param.max < 0.0:
+                logger.debug("%s needs to be positive. Changed your max value to inf.", p)
+                param.set(max=np.inf)
     return bufdict
 
 
@@ -232,8 +314,8 @@ def set_parameters(model, parameterdict=None, emcee=False):
     """
     if parameterdict is None:
         try:
-            infile = open('input.yaml', 'r')
-            bufdict = yaml.safe_load(infile)
+            bufdict = deepcopy(_load_yaml_cached('input.yaml',
+                                                 os.path.getmtime('input.yaml')))
         except OSError:
             logger.error("Please provide a yaml-input file.")
             raise
@@ -241,12 +323,12 @@ def set_parameters(model, parameterdict=None, emcee=False):
         try:
             bufdict = parameterdict.copy()
         except KeyError:
-            logger.error("Your parameterdict lacks an entry for the model. Required are: {}".format(model.param_names))
+            logger.error("Your parameterdict lacks an entry for the model. Required are: %s", model.param_names)
             raise
 
     bufdict = _clean_parameters(bufdict, model.param_names)
-    logger.debug("Setting values for parameters {}".format(model.param_names))
-    logger.debug("Parameters: {}".format(bufdict))
+    logger.debug("Setting values for parameters %s", model.param_names)
+    logger.debug("Parameters: %s", bufdict)
     for key in model.param_names:
         model.set_param_hint(key, **bufdict[key])
     parameters = model.make_params()
@@ -617,7 +699,7 @@ def _process_circuit(circuit):
     :py:class:`lmfit.model.CompositeModel` or :class:`lmfit.model.Model`
         the final model of the entire circuit
     """
-    logger.debug("circuit: {}".format(circuit))
+    logger.debug("circuit: %s", circuit)
     if isinstance(circuit, str):
         circuit = [circuit]
     if not isinstance(circuit, list):
@@ -691,10 +773,30 @@ def get_equivalent_circuit_model(modelname, logscale=False, diel=False):
     The parser is based on Pyparsing.
     It is sensitive towards extra `(` or `)` or `+`.
     Thus, keep the circuit simple.
+
+    Parsed circuits are cached, so repeated runs with the same
+    model string do not parse and build the model again.
     """
 
-    circuit = []
     assert isinstance(modelname, str), "Pass the model as a string"
+    # normalize whitespace so equivalent spellings share a cache entry
+    model = _build_equivalent_circuit_model(" ".join(modelname.split()),
+                                            logscale, diel)
+    # hand out a copy: set_param_hint mutates the model and LMFIT merges
+    # hints per key, so hints set on the cached instance would leak into
+    # later runs that reuse the same model string
+    return deepcopy(model)
+
+
+@lru_cache(maxsize=64)
+def _build_equivalent_circuit_model(modelname, logscale, diel):
+    """Parse the circuit string and build the LMFIT model.
+
+    Cached backend of :func:`get_equivalent_circuit_model`, which
+    returns copies of the cached model since models are mutated by
+    :meth:`lmfit.model.Model.set_param_hint`.
+    """
+    circuit = []
     str2parse = modelname.replace("parallel", "")
     circuit_elements = pp.Word(pp.srange("[a-zA-Z_0-9]"))
     plusop = pp.Literal('+')
@@ -715,7 +817,7 @@ def get_equivalent_circuit_model(modelname, logscale=False, diel=False):
     if logscale and diel:
         raise RuntimeError("You must chose the representation of the impedance value")
     _check_models_suffix(circuit)
-    logger.debug("Created composite model {}".format(circuit))
+    logger.debug("Created composite model %s", circuit)
     return circuit
 
 
@@ -914,7 +1016,7 @@ def _cycle_circuit(circuit, d, endpts, step=3.0, depth=0):
 
     Please file an issue if one of your circuits is not drawn properly.
     """
-    logger.debug("circuit: {}".format(circuit))
+    logger.debug("circuit: %s", circuit)
     if isinstance(circuit, str):
         circuit = [circuit]
     if not isinstance(circuit, list):
@@ -1073,14 +1175,18 @@ def KK_integral_transform(omega, Z):
     """
 
     ZKK = np.ndarray(omega.shape, dtype=complex)
+    omega2 = omega * omega
     for i, w in enumerate(omega):
         x = np.append(omega[:i], omega[i + 1:])
         real = np.append(Z.real[:i], Z.real[i + 1:])
         imag = np.append(Z.imag[:i], Z.imag[i + 1:])
+        # the denominator is shared by both integrands
+        denominator = np.append(omega2[:i], omega2[i + 1:])
+        denominator -= w * w
         # real part
-        integrand = (x * imag - w * Z.imag[i]) / (x * x - w * w)
+        integrand = (x * imag - w * Z.imag[i]) / denominator
         ZKK[i] = -2. / np.pi * simps(integrand, x=x)
         # imag part
-        integrand = (real - Z.real[i]) / (x * x - w * w)
+        integrand = (real - Z.real[i]) / denominator
         ZKK[i] += 1j * 2. * w / np.pi * simps(integrand, x=x)
     return ZKK